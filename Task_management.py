@@ -1,18 +1,17 @@
 import random
 import re
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 from supabase import create_client, Client
-import nest_asyncio
+from supabase.lib.client_options import ClientOptions
 import asyncio
 import os
 from dotenv import load_dotenv
-import spacy
 import parsedatetime
-from typing import Optional, Dict, Any, Tuple, List
-import re
-import calendar
+from functools import lru_cache
+from typing import Optional, Dict, Tuple
 
 # Load environment variables
 load_dotenv()
@@ -22,120 +21,324 @@ SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-print("Successfully connected to Supabase")
+def _require_env(**settings) -> None:
+    """Fail fast with a clear error naming any unset variables"""
+    missing = [name for name, value in settings.items() if not value]
+    if missing:
+        raise RuntimeError(
+            "Missing required environment variables: " + ", ".join(missing)
+        )
+
+# One client for the whole process, created on first use so importing
+# this module (tests, tooling) costs nothing; keep-alive lets the 2-3
+# Supabase calls per message reuse the same connection instead of paying
+# a new TLS handshake each time
+@lru_cache(maxsize=1)
+def get_supabase() -> Client:
+    """Lazily create and memoize the shared Supabase client"""
+    _require_env(SUPABASE_URL=SUPABASE_URL, SUPABASE_KEY=SUPABASE_KEY)
+    client = create_client(
+        SUPABASE_URL,
+        SUPABASE_KEY,
+        options=ClientOptions(
+            postgrest_client_timeout=10,
+            headers={"Connection": "keep-alive"},
+        ),
+    )
+    print("Successfully connected to Supabase")
+    return client
+
+# Completion phrases shared by is_completion_indicator and handle_task_completion,
+# compiled once into a single alternation so each message needs just one scan
+COMPLETION_PATTERNS = (
+    r"i have completed\s+", r"i've completed\s+", r"i have done\s+",
+    r"i've done\s+", r"i finished\s+", r"i've finished\s+",
+    r"i completed\s+", r"i've accomplished\s+", r"i accomplished\s+",
+    r"i got it done\s+", r"i've got it done\s+", r"i managed to\s+",
+    r"i've managed to\s+", r"i did\s+", r"i've handled\s+",
+    r"i handled\s+", r"i wrapped up\s+", r"i've wrapped up\s+",
+    r"is done$", r"is completed$", r"is finished$",
+    r"done$", r"completed$"
+)
+_COMPLETION_RE = re.compile("(?i)(?:" + "|".join(COMPLETION_PATTERNS) + ")")
+
+_WORD_RE = re.compile(r"\w+")
+
+# Task-query phrases shared by handle_message and is_farewell,
+# compiled once into a single alternation
+TASK_QUERY_PHRASES = (
+    'what tasks', 'show tasks', 'list tasks', 'pending tasks',
+    'due tasks', 'tasks due', 'what is due', 'what\'s due'
+)
+_TASK_QUERY_RE = re.compile("|".join(re.escape(p) for p in TASK_QUERY_PHRASES))
+
+# The end-anchored completion patterns reduce to two suffixes; checking
+# them with one C-level endswith short-circuits the regex scan for the
+# common "done" / "maths hw completed" acknowledgements
+_COMPLETION_SUFFIXES = ('done', 'completed')
 
 def is_completion_indicator(text: str) -> bool:
     """Check if the message indicates task completion"""
-    completion_indicators = [
-        r"i have completed\s+", r"i've completed\s+", r"i have done\s+",
-        r"i've done\s+", r"i finished\s+", r"i've finished\s+",
-        r"i completed\s+", r"i've accomplished\s+", r"i accomplished\s+",
-        r"i got it done\s+", r"i've got it done\s+", r"i managed to\s+",
-        r"i've managed to\s+", r"i did\s+", r"i've handled\s+",
-        r"i handled\s+", r"i wrapped up\s+", r"i've wrapped up\s+",
-        r"is done$", r"is completed$", r"is finished$",
-        r"done$", r"completed$"
-    ]
-    return any(re.search(pattern, text.lower()) for pattern in completion_indicators)
+    if text.lower().endswith(_COMPLETION_SUFFIXES):
+        return True
+    return _COMPLETION_RE.search(text) is not None
+
+TASK_VERBS = (
+    'do', 'complete', 'finish', 'submit', 'work',
+    'prepare', 'review', 'add', 'create'
+)
+
+TASK_NOUNS = (
+    'task', 'assignment', 'project', 'homework',
+    'work', 'deadline', 'due', 'chapter'
+)
+
+# Task intention indicators
+TASK_INDICATORS = (
+    # First person indicators
+    'i gotta', 'i have to', 'i need to', 'i must', 'i should',
+    'i ought to', 'i will', 'i wanna', 'i plan to', 'i intend to',
+    "i'm going to", "i'll", "i'd like to",
+
+    # Shortened versions
+    'gotta', 'need to', 'have to', 'should', 'must', 'ought to',
+    'will', 'wanna', 'plan to', 'intend to', 'gonna', 'needa',
+    'haveta', 'shoulda', 'oughta', 'will do',
+
+    # Task-specific indicators
+    'to do', 'to complete'
+)
+
+# Temporal relations for deadlines
+TEMPORAL_RELATIONS = {
+    'before': (
+        'before', 'by', 'prior to', 'earlier than', 'up until',
+        'before the end of', 'before the deadline', 'not later than',
+        'before the specified date', 'till', 'until', 'no later than'
+    ),
+    'inclusive': (
+        'on', 'including',
+    ),
+    'after': (
+        'after', 'following', 'post', 'from', 'beyond',
+        'later than', 'after the deadline', 'subsequent to',
+        'onwards', 'onward', 'starting from'
+    ),
+    'flexible': (
+        'around', 'about', 'within the week', 'within the month',
+        'sometime', 'whenever', 'at the earliest', 'as soon as',
+        'in the near future', 'approximately', 'roughly'
+    )
+}
+
+# Relative time patterns
+RELATIVE_PATTERNS = {
+    'this_week': r'this week',
+    'next_week': r'next week',
+    'this_month': r'this month',
+    'next_month': r'next month',
+    'today': r'today',
+    'tomorrow': r'tomorrow',
+    'weekend': r'(this |)weekend'
+}
+
+# Specific day patterns
+SPECIFIC_DAYS = {
+    'sunday': r'(this |next |)sunday',
+    'monday': r'(this |next |)monday',
+    'tuesday': r'(this |next |)tuesday',
+    'wednesday': r'(this |next |)wednesday',
+    'thursday': r'(this |next |)thursday',
+    'friday': r'(this |next |)friday',
+    'saturday': r'(this |next |)saturday'
+}
+
+# Tags a message as completion and/or task intent in one walk of the
+# string. Dispatch rules out completion first via is_completion_indicator
+# (the alternation is non-overlapping, so an indicator hit could swallow
+# the head of a completion phrase like "... to done"); after that, any
+# match here means task intent
+_DISPATCH_RE = re.compile(
+    "(?i)(?:(?P<completion>" + "|".join(COMPLETION_PATTERNS) + ")"
+    "|(?P<indicator>" + "|".join(re.escape(p) for p in TASK_INDICATORS) + "))"
+)
+
+# Master alternations for the parser tables, compiled at import time.
+# Named groups tell one scan which window / weekday / relation matched;
+# temporal phrases are sorted longest-first so "before the end of" wins
+# over "before".
+_RELATIVE_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in RELATIVE_PATTERNS.items())
+)
+_SPECIFIC_DAY_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in SPECIFIC_DAYS.items())
+)
+_TEMPORAL_RE = re.compile(
+    "|".join(
+        "(?P<{}>{})".format(
+            relation,
+            "|".join(re.escape(p) for p in sorted(phrases, key=len, reverse=True))
+        )
+        for relation, phrases in TEMPORAL_RELATIONS.items()
+    ),
+    re.IGNORECASE,
+)
 
 class TaskParser:
+    __slots__ = (
+        'cal', 'task_verbs', 'task_nouns', 'task_indicators',
+        'temporal_relations', 'relative_patterns', 'specific_days',
+        'temporal_re', 'relative_re', 'specific_day_re',
+    )
+
     def __init__(self):
         self.cal = parsedatetime.Calendar()
-        self.task_verbs = [
-            'do', 'complete', 'finish', 'submit', 'work',
-            'prepare', 'review', 'add', 'create'
-        ]
-        self.task_nouns = [
-            'task', 'assignment', 'project', 'homework',
-            'work', 'deadline', 'due', 'chapter'
-        ]
-
-        # Task intention indicators
-        self.task_indicators = [
-            # First person indicators
-            'i gotta', 'i have to', 'i need to', 'i must', 'i should',
-            'i ought to', 'i will', 'i wanna', 'i plan to', 'i intend to',
-            "i'm going to", "i'll", "i'd like to",
-
-            # Shortened versions
-            'gotta', 'need to', 'have to', 'should', 'must', 'ought to',
-            'will', 'wanna', 'plan to', 'intend to', 'gonna', 'needa',
-            'haveta', 'shoulda', 'oughta', 'will do',
-
-            # Task-specific indicators
-            'to do', 'to complete'
-        ]
-
-        # Temporal relations for deadlines
-        self.temporal_relations = {
-            'before': [
-                'before', 'by', 'prior to', 'earlier than', 'up until',
-                'before the end of', 'before the deadline', 'not later than',
-                'before the specified date', 'till', 'until', 'no later than'
-            ],
-            'inclusive': [
-                'on', 'including',
-            ],
-            'after': [
-                'after', 'following', 'post', 'from', 'beyond',
-                'later than', 'after the deadline', 'subsequent to',
-                'onwards', 'onward', 'starting from'
-            ],
-            'flexible': [
-                'around', 'about', 'within the week', 'within the month',
-                'sometime', 'whenever', 'at the earliest', 'as soon as',
-                'in the near future', 'approximately', 'roughly'
-            ]
-        }
-
-        # Relative time patterns
-        self.relative_patterns = {
-            'this_week': r'this week',
-            'next_week': r'next week',
-            'this_month': r'this month',
-            'next_month': r'next month',
-            'today': r'today',
-            'tomorrow': r'tomorrow',
-            'weekend': r'(this |)weekend'
-        }
-
-        # Specific day patterns
-        self.specific_days = {
-            'sunday': r'(this |next |)sunday',
-            'monday': r'(this |next |)monday',
-            'tuesday': r'(this |next |)tuesday',
-            'wednesday': r'(this |next |)wednesday',
-            'thursday': r'(this |next |)thursday',
-            'friday': r'(this |next |)friday',
-            'saturday': r'(this |next |)saturday'
-        }
+        self.task_verbs = TASK_VERBS
+        self.task_nouns = TASK_NOUNS
+        self.task_indicators = TASK_INDICATORS
+        self.temporal_relations = TEMPORAL_RELATIONS
+        self.relative_patterns = RELATIVE_PATTERNS
+        self.specific_days = SPECIFIC_DAYS
+
+        # Precompiled master alternations over the tables above
+        self.temporal_re = _TEMPORAL_RE
+        self.relative_re = _RELATIVE_RE
+        self.specific_day_re = _SPECIFIC_DAY_RE
 
     def parse_task(self, text: str) -> dict:
         # Your existing parse_task implementation
         pass
 
+# One parser for the whole process; construction rebuilds nothing per message
+_PARSER = TaskParser()
+
+# The task list is re-requested for every "show/list" message and every
+# completion attempt; a few seconds of reuse turns those repeats into a
+# dict lookup. Writes drop the cache so fresh data shows up immediately.
+_TASKS_CACHE_TTL = 10  # seconds
+
+# Only the columns the handlers actually read; select("*") shipped every
+# column over the wire just to be dropped here
+_TASK_COLUMNS = "id,Task_name,Deadline,difficulty"
+_tasks_cache: Optional[Tuple[float, list]] = None
+
+def get_tasks() -> list:
+    """Fetch all tasks, reusing a recent result within the cache TTL"""
+    global _tasks_cache
+    now = time.monotonic()
+    if _tasks_cache is not None and now - _tasks_cache[0] < _TASKS_CACHE_TTL:
+        return _tasks_cache[1]
+    tasks = get_supabase().table("Task Data").select(_TASK_COLUMNS) \
+        .order("Deadline").execute().data
+    # Tokenize each name and parse each deadline once per fetch, so the
+    # per-message paths do set intersections and datetime comparisons
+    # without re-deriving either
+    for task in tasks:
+        task['_name_lower'] = task['Task_name'].lower()
+        task['_name_tokens'] = frozenset(_WORD_RE.findall(task['_name_lower']))
+        task['_deadline_dt'] = datetime.fromisoformat(task['Deadline'])
+        task['_deadline_pretty'] = task['_deadline_dt'].strftime('%Y-%m-%d %H:%M')
+    _tasks_cache = (now, tasks)
+    return tasks
+
+def _task_deadline(task: dict) -> datetime:
+    """Parsed deadline for a row, cached on the dict after first use"""
+    deadline = task.get('_deadline_dt')
+    if deadline is None:
+        deadline = datetime.fromisoformat(task['Deadline'])
+        task['_deadline_dt'] = deadline
+    return deadline
+
+def _task_deadline_pretty(task: dict) -> str:
+    """Display form of a row's deadline, formatted once per row"""
+    pretty = task.get('_deadline_pretty')
+    if pretty is None:
+        pretty = _task_deadline(task).strftime('%Y-%m-%d %H:%M')
+        task['_deadline_pretty'] = pretty
+    return pretty
+
+def invalidate_tasks_cache() -> None:
+    """Drop the cached task list after an insert or delete"""
+    global _tasks_cache
+    _tasks_cache = None
+
+def _cached_tasks() -> Optional[list]:
+    """Return the cached task list if still fresh, else None"""
+    if _tasks_cache is not None and time.monotonic() - _tasks_cache[0] < _TASKS_CACHE_TTL:
+        return _tasks_cache[1]
+    return None
+
+# Coalesce concurrent task-list fetches: updates arriving while a fetch
+# is already in flight await the same request instead of issuing their own
+_tasks_inflight: Optional["asyncio.Task"] = None
+
+async def _fetch_tasks() -> list:
+    global _tasks_inflight
+    try:
+        return await asyncio.to_thread(get_tasks)
+    finally:
+        _tasks_inflight = None
+
+async def get_tasks_async() -> list:
+    """Fetch all tasks off the event loop, sharing one in-flight request"""
+    global _tasks_inflight
+    cached = _cached_tasks()
+    if cached is not None:
+        return cached
+    if _tasks_inflight is None:
+        _tasks_inflight = asyncio.create_task(_fetch_tasks())
+    return await _tasks_inflight
+
 def add_task_natural(text: str) -> dict:
-    parser = TaskParser()
-    task_data = parser.parse_task(text)
+    task_data = _PARSER.parse_task(text)
     if task_data:
-        result = supabase.table("Task Data").insert(task_data).execute()
+        result = get_supabase().table("Task Data").insert(task_data).execute()
+        invalidate_tasks_cache()
         return result.data[0] if result.data else None
     return None
 
-def handle_common_queries(query: str) -> list:
-    """Handle various task-related queries"""
+async def handle_common_queries(query: str) -> list:
+    """Handle various task-related queries
+
+    Date-bounded queries ("due today", "this week") are filtered
+    server-side so Supabase only returns matching rows; an index on
+    "Task Data"(Deadline) keeps those filters cheap.
+    """
     query_lower = query.lower()
-    
-    # Get all tasks
-    tasks = supabase.table("Task Data").select("*").execute().data
-    
+
+    # Push date filters down to Supabase instead of fetching every row;
+    # read the clock once per query
+    request = None
+    if 'overdue' in query_lower:
+        now = datetime.now()
+        request = get_supabase().table("Task Data").select(_TASK_COLUMNS) \
+            .lt("Deadline", now.isoformat()).order("Deadline")
+    else:
+        if 'today' in query_lower:
+            window = timedelta(days=1)
+        elif 'week' in query_lower:
+            window = timedelta(days=7)
+        else:
+            window = None
+        if window is not None:
+            start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            end = start + window
+            request = get_supabase().table("Task Data").select(_TASK_COLUMNS) \
+                .gte("Deadline", start.isoformat()).lt("Deadline", end.isoformat()) \
+                .order("Deadline")
+
+    if request is not None:
+        tasks = (await asyncio.to_thread(request.execute)).data
+    else:
+        tasks = await get_tasks_async()
+
     if not tasks:
         return []
-        
-    if any(phrase in query_lower for phrase in ['show', 'list', 'what', 'display']):
+
+    if request is not None or \
+            any(phrase in query_lower for phrase in ['show', 'list', 'what', 'display']):
         return tasks
-        
+
     # Add other query handling as needed
     return []
 
@@ -153,19 +356,92 @@ Just tell me what's on your plate, and I'll help you stay organized! 😊
 """
     await update.message.reply_text(welcome_message)
 
+# Dedicated generator instance so reply picks skip the module-level
+# random function indirection (and never contend with reseeding of the
+# shared global generator)
+_RNG = random.Random()
+
+# Response pools built once at import time instead of per message;
+# completion lines are templates filled with the finished task's name
+_COMPLETION_RESPONSES = (
+    "🎉 Awesome job finishing '{name}'! One less thing to worry about!",
+    "💪 Nice work! '{name}' is done and dusted!",
+    "✨ You crushed it! '{name}' is complete!",
+    "🌟 Great going! '{name}' is checked off your list!",
+    "🚀 Look at you go! '{name}' is finished!",
+)
+
+_GREETING_RESPONSES = (
+    "Hey there! 👋 How can I help you with your tasks today?",
+    "Hello! 😊 Ready to help you stay organized!",
+    "Hi! Need help managing your tasks?",
+    "Hey! 🌟 What can I do for you today?",
+    "Hello there! Ready to tackle some tasks?",
+    "Hi! 🎯 Let me know what you need help with!",
+    "Hey! Looking to add or check your tasks?",
+    "Hello! 📝 How can I assist you today?",
+    "Hi there! Ready to help you stay productive! ✨",
+    "Hey! Let's get those tasks organized! 🚀",
+)
+
+_FAREWELL_RESPONSES = (
+    "Catch you later! Don't forget about those tasks! 👋",
+    "Take it easy! I'll be here when you need me again! 😊",
+    "Alright, catch you on the flip side! Keep crushing those tasks! ✨",
+    "See ya! Remember, you've got this! 🌟",
+    "Later! Don't let those deadlines sneak up on you! ⏰",
+    "You're doing great! Come back anytime you need help! 🎯",
+    "Peace out! Keep that productivity flowing! 🚀",
+    "Take care! Your tasks will be waiting right here! 📝",
+    "Until next time! Stay awesome and organized! ⭐",
+    "Bye for now! Keep up the great work! 🎮",
+)
+
+# Telegram rejects messages longer than 4096 characters
+_TELEGRAM_MESSAGE_LIMIT = 4096
+
+async def reply_chunked(message, text: str) -> None:
+    """Reply in as few messages as possible, splitting only at newlines
+
+    Sends stay sequential so long task lists arrive in order.
+    """
+    while len(text) > _TELEGRAM_MESSAGE_LIMIT:
+        cut = text.rfind('\n', 0, _TELEGRAM_MESSAGE_LIMIT)
+        if cut <= 0:
+            cut = _TELEGRAM_MESSAGE_LIMIT
+        chunk = text[:cut].rstrip('\n')
+        if chunk:
+            await message.reply_text(chunk)
+        text = text[cut:].lstrip('\n')
+    # Telegram rejects empty messages, and stripping newlines around a
+    # cut can leave nothing behind (task lists end with a blank line)
+    if text:
+        await message.reply_text(text)
+
+# Difficulty commentary as a lookup instead of per-task branching;
+# anything unrecognized falls back to the easy line, as before
+_DIFFICULTY_NOTES = {
+    'Hard': "  This one's a bit challenging 💪\n",
+    'Medium': "  Moderate effort needed 🎯\n",
+}
+_DEFAULT_DIFFICULTY_NOTE = "  Should be pretty straightforward ✨\n"
+
 def format_telegram_results(tasks):
     """Format task results for Telegram display"""
     if not tasks:
         return "Looks like your schedule is clear! 🎉"
 
-    sorted_tasks = sorted(tasks, key=lambda x: datetime.fromisoformat(x['Deadline']))
-    current_date = datetime.now()
-    
-    response = "Here's what you've got on your plate:\n\n"
-    for task in sorted_tasks:
-        deadline = datetime.fromisoformat(task['Deadline'])
-        days_until = (deadline.date() - current_date.date()).days
-        
+    # Rows arrive ordered by Deadline from Postgres (every task select
+    # carries .order("Deadline")), so no client-side sort is needed
+    dated_tasks = [(_task_deadline(task), task) for task in tasks]
+    today = datetime.now().date()
+
+    # Collect the pieces and join once instead of rebuilding the string
+    # with += per line
+    parts = ["Here's what you've got on your plate:\n\n"]
+    for deadline, task in dated_tasks:
+        days_until = (deadline.date() - today).days
+
         if days_until < 0:
             days_str = f"⚠️ Yikes! This is {abs(days_until)} days overdue"
         elif days_until == 0:
@@ -174,47 +450,47 @@ def format_telegram_results(tasks):
             days_str = "📅 Due tomorrow!"
         else:
             days_str = f"✅ You've got {days_until} days to nail this"
-            
-        response += f"• {task['Task_name']}\n"
-        response += f"  Due: {deadline.strftime('%Y-%m-%d %H:%M')}\n"
-        if task['difficulty'] == 'Hard':
-            response += f"  This one's a bit challenging 💪\n"
-        elif task['difficulty'] == 'Medium':
-            response += f"  Moderate effort needed 🎯\n"
-        else:
-            response += f"  Should be pretty straightforward ✨\n"
-        response += f"  {days_str}\n\n"
-    
-    return response
+
+        parts.append(f"• {task['Task_name']}\n")
+        parts.append(f"  Due: {_task_deadline_pretty(task)}\n")
+        parts.append(_DIFFICULTY_NOTES.get(task['difficulty'], _DEFAULT_DIFFICULTY_NOTE))
+        parts.append(f"  {days_str}\n\n")
+
+    return "".join(parts)
 
 async def handle_task_completion(update: Update, context: ContextTypes.DEFAULT_TYPE, query: str):
     """Handle task completion/deletion based on various completion phrases"""
     try:
         # Remove completion indicators to get task description
-        task_description = query.lower()
-        for pattern in [
-            r"i have completed\s+", r"i've completed\s+", r"i have done\s+",
-            r"i've done\s+", r"i finished\s+", r"i've finished\s+",
-            r"i completed\s+", r"i've accomplished\s+", r"i accomplished\s+",
-            r"i got it done\s+", r"i've got it done\s+", r"i managed to\s+",
-            r"i've managed to\s+", r"i did\s+", r"i've handled\s+",
-            r"i handled\s+", r"i wrapped up\s+", r"i've wrapped up\s+",
-            r"is done$", r"is completed$", r"is finished$",
-            r"done$", r"completed$"
-        ]:
-            task_description = re.sub(pattern, "", task_description, flags=re.IGNORECASE)
-
-        # Get all tasks from the database
-        tasks = supabase.table("Task Data").select("*").execute().data
-        if not tasks:
+        task_description = _COMPLETION_RE.sub("", query.lower())
+
+        terms = frozenset(_WORD_RE.findall(task_description))
+        if not terms:
             await update.message.reply_text("No tasks available.")
             return
 
-        # Find matching tasks based on partial name match
-        matching_tasks = []
-        for task in tasks:
-            if any(term in task['Task_name'].lower() for term in task_description.split()):
-                matching_tasks.append(task)
+        # Match against the cached list when it is warm (no network);
+        # otherwise let Supabase return only candidate rows. Both paths
+        # use the same substring semantics as ilike, so a match cannot
+        # depend on cache freshness: the token intersection is only a
+        # cheap accept before the per-term substring test
+        tasks = _cached_tasks()
+        if tasks is not None:
+            matching_tasks = [
+                task for task in tasks
+                if terms & task['_name_tokens']
+                or any(term in task['_name_lower'] for term in terms)
+            ]
+        else:
+            # Tokens are \w+ so the only LIKE metacharacter they can
+            # carry is underscore; escape it so it matches literally
+            name_filter = ",".join(
+                "Task_name.ilike.%{}%".format(term.replace('_', r'\_'))
+                for term in terms
+            )
+            request = get_supabase().table("Task Data").select(_TASK_COLUMNS) \
+                .or_(name_filter).order("Deadline")
+            matching_tasks = (await asyncio.to_thread(request.execute)).data
 
         if not matching_tasks:
             await update.message.reply_text(f"No tasks found matching '{task_description}'.")
@@ -223,25 +499,22 @@ async def handle_task_completion(update: Update, context: ContextTypes.DEFAULT_T
         # If there's exactly one match, complete it directly
         if len(matching_tasks) == 1:
             task_to_delete = matching_tasks[0]
-            supabase.table("Task Data").delete().eq("id", task_to_delete['id']).execute()
-            completion_responses = [
-                f"🎉 Awesome job finishing '{task_to_delete['Task_name']}'! One less thing to worry about!",
-                f"💪 Nice work! '{task_to_delete['Task_name']}' is done and dusted!",
-                f"✨ You crushed it! '{task_to_delete['Task_name']}' is complete!",
-                f"🌟 Great going! '{task_to_delete['Task_name']}' is checked off your list!",
-                f"🚀 Look at you go! '{task_to_delete['Task_name']}' is finished!"
-            ]
-            await update.message.reply_text(random.choice(completion_responses))
+            await asyncio.to_thread(
+                get_supabase().table("Task Data").delete().eq("id", task_to_delete['id']).execute
+            )
+            invalidate_tasks_cache()
+            await update.message.reply_text(
+                _RNG.choice(_COMPLETION_RESPONSES).format(name=task_to_delete['Task_name'])
+            )
             return
 
         # If there are multiple matches, show them as a numbered list with inline keyboard
-        task_list = "I found a few tasks that could match. Which one did you complete?\n\n"
+        task_lines = ["I found a few tasks that could match. Which one did you complete?\n"]
         for idx, task in enumerate(matching_tasks, 1):
-            deadline = datetime.fromisoformat(task['Deadline'])
-            task_list += f"{idx}. {task['Task_name']} (due {deadline.strftime('%Y-%m-%d %H:%M')})\n"
-        
-        task_list += "\nJust send me the number! 😊"
-        await update.message.reply_text(task_list)
+            task_lines.append(f"{idx}. {task['Task_name']} (due {_task_deadline_pretty(task)})")
+
+        task_lines.append("\nJust send me the number! 😊")
+        await update.message.reply_text("\n".join(task_lines))
         
         # Store the matching tasks in the context for later use
         context.user_data['pending_completion'] = matching_tasks
@@ -249,88 +522,69 @@ async def handle_task_completion(update: Update, context: ContextTypes.DEFAULT_T
     except Exception as e:
         await update.message.reply_text(f"Error handling task completion: {str(e)}")
 
+GREETING_PHRASES = frozenset({
+    # Basic greetings
+    'hi', 'hello', 'hey', 'yo', 'hola', 'howdy', 'sup',
+    'greetings', 'good morning', 'good afternoon', 'good evening',
+
+    # Casual greetings
+    'heya', 'hiya', 'hi there', 'hello there', 'hey there',
+    'what\'s up', 'whats up', 'wassup', 'what up', 'sup',
+
+    # How are you variants
+    'how are you', 'how\'s it going', 'how you doing',
+    'how r u', 'how are u', 'how r you',
+
+    # Time-based
+    'morning', 'afternoon', 'evening', 'night',
+
+    # Informal
+    'yo yo', 'heyo', 'heyy', 'hii', 'hihi', 'hola',
+    'aloha', 'bonjour', 'ciao'
+})
+
+# Greetings are prefix matches, so bucket them by first character: a
+# message only ever tests the handful of phrases sharing its first letter
+def _index_by_first_char(phrases) -> Dict[str, Tuple[str, ...]]:
+    index: Dict[str, list] = {}
+    for phrase in sorted(phrases, key=len, reverse=True):
+        index.setdefault(phrase[0], []).append(phrase)
+    return {char: tuple(bucket) for char, bucket in index.items()}
+
+_GREETINGS_BY_FIRST_CHAR = _index_by_first_char(GREETING_PHRASES)
+
 def is_greeting(text: str) -> bool:
     """Check if the message is a greeting"""
-    greeting_phrases = {
-        # Basic greetings
-        'hi', 'hello', 'hey', 'yo', 'hola', 'howdy', 'sup', 
-        'greetings', 'good morning', 'good afternoon', 'good evening',
-        
-        # Casual greetings
-        'heya', 'hiya', 'hi there', 'hello there', 'hey there',
-        'what\'s up', 'whats up', 'wassup', 'what up', 'sup',
-        
-        # How are you variants
-        'how are you', 'how\'s it going', 'how you doing',
-        'how r u', 'how are u', 'how r you',
-        
-        # Time-based
-        'morning', 'afternoon', 'evening', 'night',
-        
-        # Informal
-        'yo yo', 'heyo', 'heyy', 'hii', 'hihi', 'hola',
-        'aloha', 'bonjour', 'ciao'
-    }
-    
     text_lower = text.lower().strip()
-    
-    # Check for exact matches
-    if any(text_lower == phrase for phrase in greeting_phrases):
-        return True
-    
-    # Check for partial matches at the start of the message
-    return any(text_lower.startswith(phrase) for phrase in greeting_phrases)
+    candidates = _GREETINGS_BY_FIRST_CHAR.get(text_lower[:1])
+    if not candidates:
+        return False
+    return any(text_lower.startswith(phrase) for phrase in candidates)
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle incoming messages."""
     query = update.message.text.strip()
-    
+    query_lower = query.lower()
+
     try:
         # Check for greetings first
         if is_greeting(query):
-            greeting_responses = [
-                "Hey there! 👋 How can I help you with your tasks today?",
-                "Hello! 😊 Ready to help you stay organized!",
-                "Hi! Need help managing your tasks?",
-                "Hey! 🌟 What can I do for you today?",
-                "Hello there! Ready to tackle some tasks?",
-                "Hi! 🎯 Let me know what you need help with!",
-                "Hey! Looking to add or check your tasks?",
-                "Hello! 📝 How can I assist you today?",
-                "Hi there! Ready to help you stay productive! ✨",
-                "Hey! Let's get those tasks organized! 🚀"
-            ]
-            await update.message.reply_text(random.choice(greeting_responses))
+            await update.message.reply_text(_RNG.choice(_GREETING_RESPONSES))
             return
             
         # Check if it's a task query
-        if any(phrase in query.lower() for phrase in [
-            'what tasks', 'show tasks', 'list tasks', 'pending tasks',
-            'due tasks', 'tasks due', 'what is due', 'what\'s due'
-        ]):
-            results = handle_common_queries(query)
+        if _TASK_QUERY_RE.search(query_lower):
+            results = await handle_common_queries(query)
             if results:
                 response = format_telegram_results(results)
-                await update.message.reply_text(response)
+                await reply_chunked(update.message, response)
             else:
                 await update.message.reply_text("No tasks found for your query! 🎉")
             return
             
         # Then check for farewells
         if is_farewell(query):
-            farewell_responses = [
-                "Catch you later! Don't forget about those tasks! 👋",
-                "Take it easy! I'll be here when you need me again! 😊",
-                "Alright, catch you on the flip side! Keep crushing those tasks! ✨",
-                "See ya! Remember, you've got this! 🌟",
-                "Later! Don't let those deadlines sneak up on you! ⏰",
-                "You're doing great! Come back anytime you need help! 🎯",
-                "Peace out! Keep that productivity flowing! 🚀",
-                "Take care! Your tasks will be waiting right here! 📝",
-                "Until next time! Stay awesome and organized! ⭐",
-                "Bye for now! Keep up the great work! 🎮"
-            ]
-            await update.message.reply_text(random.choice(farewell_responses))
+            await update.message.reply_text(_RNG.choice(_FAREWELL_RESPONSES))
             return
 
         # Check if this is a response to a pending task completion
@@ -340,7 +594,10 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             
             if 1 <= choice_num <= len(matching_tasks):
                 task_to_delete = matching_tasks[choice_num - 1]
-                supabase.table("Task Data").delete().eq("id", task_to_delete['id']).execute()
+                await asyncio.to_thread(
+                    get_supabase().table("Task Data").delete().eq("id", task_to_delete['id']).execute
+                )
+                invalidate_tasks_cache()
                 await update.message.reply_text(
                     f"Great job! Task '**{task_to_delete['Task_name']}**' has been marked as completed and removed from your list."
                 )
@@ -351,78 +608,80 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 await update.message.reply_text("Invalid number. Please try again.")
                 return
                 
-        if is_completion_indicator(query):
+        if is_completion_indicator(query_lower):
             # Handle task completion/deletion - pass context parameter
             await handle_task_completion(update, context, query)
-        elif any(indicator in query.lower() for indicator in TaskParser().task_indicators) or \
-             query.lower().startswith('add'):
+        elif _DISPATCH_RE.search(query_lower) is not None or \
+             query_lower.startswith('add'):
             # Handle task addition
-            added_task = add_task_natural(query)
+            added_task = await asyncio.to_thread(add_task_natural, query)
             response = f"Task added: {added_task['Task_name'] if added_task else 'Failed to add task'}"
             await update.message.reply_text(response)
-        elif query.lower().startswith('delete'):
+        elif query_lower.startswith('delete'):
             # Handle explicit deletion
             delete_task(query)
             await update.message.reply_text("Task deletion processed.")
         else:
             # Handle other queries
-            results = handle_common_queries(query)
+            results = await handle_common_queries(query)
             if results:
                 # Format results for Telegram
                 response = format_telegram_results(results)
             else:
                 response = "No results to display."
-            await update.message.reply_text(response)
+            await reply_chunked(update.message, response)
         
     except Exception as e:
         error_message = f"Error processing your request: {str(e)}"
         await update.message.reply_text(error_message)
 
+FAREWELL_PHRASES = frozenset({
+    # Original farewells
+    'bye', 'goodbye', 'see you', 'cool', 'ok', 'okay', 'cya',
+    'later', 'take care', 'ttyl', 'gtg', 'got to go',
+    'have to go', 'catch you later', 'peace out',
+
+    # Additional casual acknowledgments
+    'alright', 'aight', 'good to go', "let's go", 'lesgo',
+    'lessgo', 'lessgoo', 'lessgooo', 'lets go',
+    'sounds good', 'perfect', 'great', 'awesome',
+    'nice', 'got it', 'understood', 'roger that',
+    'will do', 'noted', 'right on',
+
+    # Follow-up responses
+    'yeah', 'yep', 'yup', 'yes', 'sure', 'k',
+    'kk', 'mhm', 'uh huh', 'right', 'yea', 'yea boi'
+})
+
+# Single-word farewells can be found with one substring scan: the needles
+# contain no spaces, so a hit can never span a word boundary
+_FAREWELL_SUB_RE = re.compile(
+    "|".join(re.escape(p) for p in FAREWELL_PHRASES if ' ' not in p)
+)
+
+# Anything longer than the longest phrase cannot be an exact match, so
+# long messages skip hashing entirely
+_MAX_FAREWELL_LEN = max(len(p) for p in FAREWELL_PHRASES)
+
 def is_farewell(text: str) -> bool:
     """Check if the message is a farewell or casual acknowledgment"""
-    # First check if it's a task query
-    task_queries = [
-        'what tasks', 'show tasks', 'list tasks', 'pending tasks',
-        'due tasks', 'tasks due', 'what is due', 'what\'s due'
-    ]
-    
     text_lower = text.lower().strip()
-    
+
     # If it's a task query, it's not a farewell
-    if any(query in text_lower for query in task_queries):
+    if _TASK_QUERY_RE.search(text_lower):
         return False
-    
-    farewell_phrases = {
-        # Original farewells
-        'bye', 'goodbye', 'see you', 'cool', 'ok', 'okay', 'cya', 
-        'later', 'take care', 'ttyl', 'gtg', 'got to go', 
-        'have to go', 'catch you later', 'peace out',
-        
-        # Additional casual acknowledgments
-        'alright', 'aight', 'good to go', "let's go", 'lesgo', 
-        'lessgo', 'lessgoo', 'lessgooo', 'lets go', 
-        'sounds good', 'perfect', 'great', 'awesome',
-        'nice', 'got it', 'understood', 'roger that',
-        'will do', 'noted', 'right on',
-        
-        # Follow-up responses
-        'yeah', 'yep', 'yup', 'yes', 'sure', 'k', 
-        'kk', 'mhm', 'uh huh', 'right', 'yea', 'yea boi'
-    }
-    
+
     # Check for exact matches first
-    if any(text_lower == phrase for phrase in farewell_phrases):
+    if len(text_lower) <= _MAX_FAREWELL_LEN and text_lower in FAREWELL_PHRASES:
         return True
-    
+
     # Check for partial matches within words
-    words = text_lower.split()
-    return any(
-        any(phrase in word for word in words)
-        for phrase in farewell_phrases
-    ) and not any(query in text_lower for query in task_queries)
+    return _FAREWELL_SUB_RE.search(text_lower) is not None
 
 if __name__ == "__main__":
     try:
+        _require_env(TELEGRAM_TOKEN=TELEGRAM_TOKEN)
+
         # Create the Application and pass it your bot's token
         application = Application.builder().token(TELEGRAM_TOKEN).build()
 
@@ -1 +1 @@
-python -m spacy download en_core_web_sm
+pip install -r requirements.txt